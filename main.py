@@ -2,50 +2,104 @@
 import uasyncio
 import network
 import ujson
-from machine import Pin, reset
+from machine import Pin, Timer, reset
 from microdot import Microdot, Response, send_file
 from microdot.websocket import with_websocket
 from ir_tx.rp2_rmt import RP2_RMT
 from array import array
+import rp2
 import motor # Changed from 'stepper'
 import gc
+import os
 import utime
+try:
+    import umsgpack # Optional: enables the binary config.mp copy of the settings
+except ImportError:
+    umsgpack = None
 
 # --- Hardware Setup (Pins are now constants) ---
 STEPPER_PINS = [21, 20, 19, 18]
 BUTTON_PIN_NUM = 22
+LONG_PRESS_MS = 500
+RELEASE_SETTLE_MS = 30
+BUTTON_LOCKOUT_MS = 250
 WIRED_SHUTTER_PIN_NUM = 10
 IR_TX_PIN_NUM = 13
 STEPS_PER_DEGREE = (1650688 * 6) / (360 * 810)
+STEPPER_SM_ID = 1 # PIO0 SM1; the IR transmitter uses PIO0 SM0 and the CYW43 Wi-Fi driver claims PIO1
+STEPPER_SM_FREQ = 1_000_000 # 1us per PIO cycle
+SPIN_BURST_MS = 100 # Approximate length of each step burst queued while spinning
+WIFI_CONNECT_TIMEOUT_MS = 10000
+WIFI_POLL_MS = 100
 CONFIG_FILE = 'config.json'
+CONFIG_MP_FILE = 'config.mp'
 HTML_FILE = 'index.html'
 SETTINGS_HTML_FILE = 'settings.html'
+HTML_MAX_AGE = 86400 # Seconds browsers may cache the web pages
+HTML_GZIP_HEADERS = {
+    'Content-Type': 'text/html',
+    'Content-Encoding': 'gzip',
+    'Cache-Control': 'max-age={}'.format(HTML_MAX_AGE),
+}
+# Status messages never contain double quotes, so the payload can be formatted directly.
+STATUS_TEMPLATE = '{"message":"%s","mode":"%s","speed":%d,"trigger_mode":"%s"}'
 
 # --- Global State & Settings ---
 lock = uasyncio.Lock()
 clients = set()
 settings = {}
+settings_json_cache = b'{}'
 op_mode = 'IDLE'
 op_params = {}
+op_abort = False # Set by 'stop'; read without the lock while a rotation is running
 status_message = "Ready"
 SPIN_SPEEDS = []
 current_speed_index = 1
-button_press_start_time = 0
 is_button_down = False
 long_press_action_taken = False
 button_action_pending = None
 button_state = 'IDLE'
-debounce_deadline = 0
 trigger_mode = 'WIRED'
 
 # --- Settings and Configuration Management ---
+def config_json_stamp():
+    """Returns [size, mtime] of config.json, used to tell whether config.mp still matches it."""
+    st = os.stat(CONFIG_FILE)
+    return [st[6], st[8]]
+
+def load_msgpack_settings():
+    """Loads settings from config.mp if umsgpack is available and config.json hasn't changed since it was written."""
+    if umsgpack is None: return None
+    try:
+        with open(CONFIG_MP_FILE, 'rb') as f:
+            stamp, s = umsgpack.load(f)
+        # Compare for equality, not order: the RTC resets on every boot, so mtimes aren't monotonic.
+        if list(stamp) != config_json_stamp(): return None
+        print("Settings loaded from config.mp")
+        return s
+    except Exception:
+        return None
+
+def save_msgpack_settings(new_settings):
+    """Writes the fast-loading config.mp copy of the settings, stamped with config.json's size and mtime."""
+    if umsgpack is None: return
+    try:
+        stamp = config_json_stamp()
+        with open(CONFIG_MP_FILE, 'wb') as f:
+            umsgpack.dump([stamp, new_settings], f)
+    except OSError as e:
+        print(f"Error saving {CONFIG_MP_FILE}: {e}")
+
 def load_settings():
-    """Loads settings from config.json, or creates it with defaults."""
-    global SPIN_SPEEDS, trigger_mode
+    """Loads settings from config.mp or config.json, or creates config.json with defaults."""
+    global SPIN_SPEEDS, trigger_mode, settings_json_cache
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            s = ujson.load(f)
-            print("Settings loaded from config.json")
+        s = load_msgpack_settings()
+        if s is None:
+            with open(CONFIG_FILE, 'r') as f:
+                s = ujson.load(f)
+                print("Settings loaded from config.json")
+            save_msgpack_settings(s)
     except (OSError, ValueError):
         print("Config file not found or invalid. Creating with default settings.")
         s = {
@@ -66,28 +120,94 @@ def load_settings():
         save_settings(s) # Save the defaults
     
     SPIN_SPEEDS = [s['speeds_ms']['slow'], s['speeds_ms']['normal'], s['speeds_ms']['fast']]
+    settings_json_cache = ujson.dumps(s).encode()
     
     return s
 
 def save_settings(new_settings):
-    """Saves the provided dictionary to config.json."""
+    """Saves the provided dictionary to config.json and config.mp."""
     try:
         with open(CONFIG_FILE, 'w') as f:
             ujson.dump(new_settings, f)
+        save_msgpack_settings(new_settings)
         print("Settings saved successfully.")
         return True
     except OSError as e:
         print(f"Error saving settings: {e}")
         return False
 
+def load_web_page(file_path):
+    """Reads the gzipped copy of a page into RAM, or returns None if it is missing."""
+    try:
+        with open(file_path + '.gz', 'rb') as f:
+            return f.read()
+    except OSError:
+        print(f"{file_path}.gz not found. Serving {file_path} from flash.")
+        return None
+
 # --- Initialize Hardware & Load Settings ---
 settings = load_settings()
+INDEX_BUF = load_web_page(HTML_FILE)
+SETTINGS_BUF = load_web_page(SETTINGS_HTML_FILE)
 onboard_led = Pin('LED', Pin.OUT, value=0)
 stepper_motor = motor.FullStepMotor.frompins(*STEPPER_PINS) # Changed from 'stepper'
 wired_shutter = Pin(WIRED_SHUTTER_PIN_NUM, Pin.OUT, value=0)
 ir_transmitter = RP2_RMT(pin_pulse=None, carrier=(Pin(IR_TX_PIN_NUM, Pin.OUT), 32700, 33))
+# RP2_RMT.send() keeps a reference to this array and feeds the PIO from it, so
+# each trigger reuses the same buffer without copying. It ends with a space and
+# a STOP, so send() never has to extend it.
 SHUTTER_SIGNAL = array('H', [550, 7200, 550, 40000, 0])
 button = Pin(BUTTON_PIN_NUM, Pin.IN, Pin.PULL_DOWN)
+long_press_timer = Timer()
+debounce_timer = Timer()
+stepper_sm = rp2.StateMachine(STEPPER_SM_ID) # Configured by stepper_release() once the motor task starts
+
+# --- Stepper PIO Program ---
+# Each burst is two FIFO words: the number of 4-phase cycles minus one, then the
+# delay-loop count per phase. Side-set bits map to pins 18..21 (bit 0 = pin 18).
+# The coils stay off until the first burst after init; after that the last
+# phase stays energized between bursts to keep holding torque.
+# A word is pushed to the RX FIFO when a burst completes.
+@rp2.asm_pio(sideset_init=(rp2.PIO.OUT_LOW,) * 4)
+def full_step_burst():
+    pull(block)             .side(0b0000)
+    mov(x, osr)             .side(0b0000)
+    pull(block)             .side(0b0000)
+    wrap_target()
+    label("cycle")
+    mov(y, osr)             .side(0b1100)
+    label("phase_1")
+    jmp(y_dec, "phase_1")   .side(0b1100)
+    mov(y, osr)             .side(0b0110)
+    label("phase_2")
+    jmp(y_dec, "phase_2")   .side(0b0110)
+    mov(y, osr)             .side(0b0011)
+    label("phase_3")
+    jmp(y_dec, "phase_3")   .side(0b0011)
+    mov(y, osr)             .side(0b1001)
+    label("phase_4")
+    jmp(y_dec, "phase_4")   .side(0b1001)
+    jmp(x_dec, "cycle")     .side(0b1001)
+    push(noblock)           .side(0b1001)
+    pull(block)             .side(0b1001)
+    mov(x, osr)             .side(0b1001)
+    pull(block)             .side(0b1001)
+    wrap()
+
+def stepper_phase_delay(stepms):
+    """Returns the delay-loop count that holds each phase for stepms milliseconds (at least 1)."""
+    stepms = max(stepms, 1)
+    return stepms * (STEPPER_SM_FREQ // 1000) - 2
+
+def stepper_burst_cycles(stepms):
+    """Returns how many 4-phase cycles make up a SPIN_BURST_MS burst at stepms milliseconds per step."""
+    stepms = max(stepms, 1)
+    return max(SPIN_BURST_MS // (4 * stepms), 1)
+
+def stepper_release():
+    """Flushes any queued bursts and de-energizes the coils."""
+    stepper_sm.init(full_step_burst, freq=STEPPER_SM_FREQ, sideset_base=Pin(STEPPER_PINS[-1]))
+    stepper_sm.active(1)
 
 # --- Initialize Microdot App ---
 app = Microdot()
@@ -101,13 +221,17 @@ async def connect_to_wifi():
         if wlan.isconnected(): return True
         print(f"Connecting to {net['ssid']}...")
         wlan.connect(net['ssid'], net['password'])
-        for _ in range(10):
-            if wlan.isconnected():
+        for i in range(WIFI_CONNECT_TIMEOUT_MS // WIFI_POLL_MS):
+            status = wlan.status()
+            if status == network.STAT_GOT_IP:
                 print(f"Connected! IP: {wlan.ifconfig()[0]}")
                 onboard_led.off()
                 return True
-            onboard_led.toggle()
-            await uasyncio.sleep_ms(1000)
+            if status < 0: # Wrong password, no AP found or connect failure
+                print(f"Could not connect to {net['ssid']} (status {status}).")
+                break
+            if i % (1000 // WIFI_POLL_MS) == 0: onboard_led.toggle() # Once per second, as before
+            await uasyncio.sleep_ms(WIFI_POLL_MS)
     print("Failed to connect to any saved Wi-Fi networks.")
     onboard_led.off()
     return False
@@ -121,9 +245,12 @@ def start_access_point():
     print(f"Access Point '{ap_ssid}' started! IP: {ap.ifconfig()[0]}")
     onboard_led.on()
 
-def get_web_page(file_path):
+def get_web_page(file_path, page_buf):
+    """Serves a page from its preloaded gzipped buffer, falling back to the plain file."""
+    if page_buf is not None:
+        return Response(body=page_buf, headers=HTML_GZIP_HEADERS)
     try:
-        return send_file(file_path)
+        return send_file(file_path, max_age=HTML_MAX_AGE)
     except OSError:
         return "<h1>Error</h1><p>Could not load web interface. Make sure {} is on the device.</p>".format(file_path), 500
 
@@ -145,18 +272,13 @@ async def broadcast_status():
     global status_message, op_mode, op_params, current_speed_index, SPIN_SPEEDS, trigger_mode
     async with lock:
         current_speed = op_params.get('speed', SPIN_SPEEDS[current_speed_index])
-        payload = {
-            "message": status_message, 
-            "mode": op_mode, 
-            "speed": current_speed,
-            "trigger_mode": trigger_mode,
-        }
-        json_payload = ujson.dumps(payload)
-    for client in list(clients):
-        try:
-            await client.send(json_payload)
-        except Exception:
-            clients.remove(client)
+        json_payload = STATUS_TEMPLATE % (status_message, op_mode, current_speed, trigger_mode)
+    # Send to all clients concurrently so one slow client can't hold up the rest.
+    targets = list(clients)
+    results = await uasyncio.gather(*[client.send(json_payload) for client in targets], return_exceptions=True)
+    for client, result in zip(targets, results):
+        if isinstance(result, Exception):
+            clients.discard(client)
 
 # --- Camera Trigger Function ---
 async def trigger_camera():
@@ -173,68 +295,118 @@ async def trigger_camera():
     await uasyncio.sleep_ms(50)
     onboard_led.off()
 
-# --- Command Handler ---
-async def handle_command(data):
-    global op_mode, op_params, current_speed_index, trigger_mode, SPIN_SPEEDS
-    command = data.get('command')
-    
-    if command == 'set_trigger_mode':
-        async with lock:
-            new_mode = data.get('mode')
-            if new_mode in ['WIRED', 'IR']: trigger_mode = new_mode
-    elif command == 'start_spin':
-        async with lock:
-            speed = data.get('speed', settings['speeds_ms']['normal'])
+# --- Command Handlers ---
+async def _set_trigger_mode(data):
+    global trigger_mode
+    async with lock:
+        new_mode = data.get('mode')
+        if new_mode in ['WIRED', 'IR']: trigger_mode = new_mode
+
+def parse_speed(data):
+    """Returns the command's speed as an int, or None if it isn't numeric."""
+    try:
+        return int(data.get('speed', settings['speeds_ms']['normal']))
+    except (TypeError, ValueError):
+        print(f"Ignoring {data.get('command')} with invalid speed: {data}")
+        return None
+
+async def _start_spin(data):
+    global op_mode, op_params, current_speed_index
+    speed = parse_speed(data)
+    if speed is None: return
+    async with lock:
+        if speed in SPIN_SPEEDS: current_speed_index = SPIN_SPEEDS.index(speed)
+        op_mode, op_params = 'SPIN', {'speed': speed}
+
+async def _set_speed(data):
+    global current_speed_index
+    speed = parse_speed(data)
+    if speed is None: return
+    async with lock:
+        if op_mode == 'SPIN':
+            op_params['speed'] = speed
             if speed in SPIN_SPEEDS: current_speed_index = SPIN_SPEEDS.index(speed)
-            op_mode, op_params = 'SPIN', {'speed': speed}
-    elif command == 'set_speed':
-        async with lock:
-            if op_mode == 'SPIN':
-                speed = data.get('speed', settings['speeds_ms']['normal'])
-                op_params['speed'] = speed
-                if speed in SPIN_SPEEDS: current_speed_index = SPIN_SPEEDS.index(speed)
-    elif command == 'start_photo_sequence':
-        async with lock:
-            deg = data.get('deg', 45)
-            speed = data.get('speed', settings['speeds_ms']['normal'])
-            delay = data.get('delay', settings['photo_delays_ms']['medium'])
-            op_mode, op_params = 'SEQUENCE', {'deg': deg, 'speed': speed, 'delay': delay}
-    elif command == 'take_picture':
-        async with lock: op_mode = 'PICTURE'
-    elif command == 'stop':
-        async with lock: op_mode = 'IDLE'
-    elif command == 'debug_ir_trigger':
-        print("DEBUG: Triggering IR")
-        ir_transmitter.send(SHUTTER_SIGNAL)
-    elif command == 'debug_wired_shutter':
-        state = data.get('state', False)
-        print(f"DEBUG: Setting Wired Shutter to {'ON' if state else 'OFF'}")
-        wired_shutter.value(1 if state else 0)
+
+async def _start_photo_sequence(data):
+    global op_mode, op_params, status_message
+    try:
+        deg = int(data.get('deg', 45))
+        speed = max(int(data.get('speed', settings['speeds_ms']['normal'])), 1) # Same 1 ms floor as the PIO
+        delay = int(data.get('delay', settings['photo_delays_ms']['medium']))
+        valid = 1 <= deg <= 360 and delay >= 0
+    except (TypeError, ValueError):
+        valid = False
+    if not valid:
+        print(f"Ignoring start_photo_sequence with invalid parameters: {data}")
+        async with lock: status_message = "Invalid sequence parameters. Sequence not started."
+        return
+    async with lock:
+        # Precomputed here so the motor task doesn't need the lock to start the sequence.
+        op_mode, op_params = 'SEQUENCE', {
+            'deg': deg, 'speed': speed, 'delay': delay,
+            '_total_steps': 360 // deg,
+            '_steps_per_rot': int(deg * STEPS_PER_DEGREE),
+            '_phase_delay': stepper_phase_delay(speed),
+        }
+
+async def _take_picture(data):
+    global op_mode
+    async with lock: op_mode = 'PICTURE'
+
+async def _stop(data):
+    global op_mode, op_abort
+    op_abort = True
+    async with lock: op_mode = 'IDLE'
+
+async def _debug_ir_trigger(data):
+    print("DEBUG: Triggering IR")
+    ir_transmitter.send(SHUTTER_SIGNAL)
+
+async def _debug_wired_shutter(data):
+    state = data.get('state', False)
+    print(f"DEBUG: Setting Wired Shutter to {'ON' if state else 'OFF'}")
+    wired_shutter.value(1 if state else 0)
+
+COMMAND_HANDLERS = {
+    'set_trigger_mode': _set_trigger_mode,
+    'start_spin': _start_spin,
+    'set_speed': _set_speed,
+    'start_photo_sequence': _start_photo_sequence,
+    'take_picture': _take_picture,
+    'stop': _stop,
+    'debug_ir_trigger': _debug_ir_trigger,
+    'debug_wired_shutter': _debug_wired_shutter,
+}
+
+async def handle_command(data):
+    handler = COMMAND_HANDLERS.get(data.get('command'))
+    if handler: await handler(data)
 
 # --- Microdot Route Handlers ---
 @app.route('/')
 async def index(request):
-    return get_web_page(HTML_FILE)
+    return get_web_page(HTML_FILE, INDEX_BUF)
 
 @app.route('/settings')
 async def settings_page(request):
-    return get_web_page(SETTINGS_HTML_FILE)
+    return get_web_page(SETTINGS_HTML_FILE, SETTINGS_BUF)
 
 @app.route('/api/settings', methods=['GET', 'POST'])
 async def api_settings(request):
-    global settings
+    global settings, settings_json_cache
     if request.method == 'POST':
         try:
             new_settings = request.json
             if save_settings(new_settings):
                 settings = new_settings
+                settings_json_cache = ujson.dumps(settings).encode()
                 return Response(body={'status': 'ok', 'message': 'Settings saved. Rebooting to apply all changes...'}, status_code=200)
             else:
                 return Response(body={'status': 'error', 'message': 'Failed to save settings to file.'}, status_code=500)
         except Exception as e:
             return Response(body={'status': 'error', 'message': f'Invalid data format: {e}'}, status_code=400)
     else: # GET
-        return Response(body=settings, headers={'Content-Type': 'application/json'})
+        return Response(body=settings_json_cache, headers={'Content-Type': 'application/json'})
 
 @app.route('/api/reboot', methods=['POST'])
 async def api_reboot(request):
@@ -263,39 +435,61 @@ async def websocket_handler(request, ws):
     except Exception as e:
         print(f"WebSocket Error/Disconnect: {e}")
     finally:
-        clients.remove(ws)
+        clients.discard(ws)
         print("Client disconnected.")
 
-# --- Interrupt handler ---
+# --- Interrupt handlers ---
+def start_button_lockout():
+    """Ignores button edges until the lockout timer expires."""
+    global button_state
+    button_state = 'DEBOUNCING'
+    debounce_timer.init(mode=Timer.ONE_SHOT, period=BUTTON_LOCKOUT_MS, callback=end_button_lockout)
+
+def end_button_lockout(timer):
+    global button_state
+    button_state = 'IDLE'
+
+def long_press_cb(timer):
+    global long_press_action_taken, button_action_pending
+    if is_button_down and button.value() == 1:
+        long_press_action_taken, button_action_pending = True, 'toggle_spin'
+
+def release_settle_cb(timer):
+    global button_action_pending
+    if not is_button_down and button.value() == 0:
+        button_action_pending = 'cycle_speed'
+        start_button_lockout()
+
 def button_handler(pin):
-    global button_press_start_time, is_button_down, long_press_action_taken, button_action_pending, button_state, debounce_deadline
+    global is_button_down, long_press_action_taken
     if button_state == 'DEBOUNCING': return
     if pin.value() == 1:
         if not is_button_down:
             is_button_down, long_press_action_taken = True, False
-            button_press_start_time = utime.ticks_ms()
+            long_press_timer.init(mode=Timer.ONE_SHOT, period=LONG_PRESS_MS, callback=long_press_cb)
     else:
         if is_button_down:
             is_button_down = False
-            if not long_press_action_taken:
-                button_action_pending = 'cycle_speed'
-                button_state, debounce_deadline = 'DEBOUNCING', utime.ticks_add(utime.ticks_ms(), 250)
+            long_press_timer.deinit()
+            if long_press_action_taken:
+                start_button_lockout()
+            else:
+                # Re-sample after the contacts settle; a bounce re-arms this timer.
+                debounce_timer.init(mode=Timer.ONE_SHOT, period=RELEASE_SETTLE_MS, callback=release_settle_cb)
 
 # --- Motor Control Task ---
 async def motor_control_task():
-    global op_mode, op_params, status_message, button_action_pending, current_speed_index, is_button_down, long_press_action_taken, button_state, debounce_deadline, SPIN_SPEEDS
+    global op_mode, op_params, op_abort, status_message, button_action_pending, current_speed_index, SPIN_SPEEDS
     last_op_mode, applied_spin_speed = 'NONE', -1
     seq_step, seq_total_steps, seq_steps_per_rotation, seq_steps_to_rotate_remaining = 0, 0, 0, 0
+    seq_phase_delay, seq_delay, spin_phase_delay, spin_burst_cycles = 0, 0, 0, 1
     sub_state = 'DONE'
     last_broadcast_time = 0
+    # Local bindings avoid a global/attribute lookup per use inside the loop.
+    ticks_ms, ticks_diff, sleep_ms = utime.ticks_ms, utime.ticks_diff, uasyncio.sleep_ms
+    sm_put, sm_tx_fifo, sm_rx_fifo = stepper_sm.put, stepper_sm.tx_fifo, stepper_sm.rx_fifo
 
     while True:
-        if button_state == 'DEBOUNCING' and utime.ticks_diff(utime.ticks_ms(), debounce_deadline) > 0:
-            button_state = 'IDLE'
-        if is_button_down and not long_press_action_taken:
-            if utime.ticks_diff(utime.ticks_ms(), button_press_start_time) >= 500:
-                long_press_action_taken, button_action_pending = True, 'toggle_spin'
-                button_state, debounce_deadline = 'DEBOUNCING', utime.ticks_add(utime.ticks_ms(), 250)
         if button_action_pending is not None:
             action, button_action_pending = button_action_pending, None
             async with lock:
@@ -309,47 +503,49 @@ async def motor_control_task():
             async with lock:
                 current_mode = op_mode
                 desired_spin_speed = SPIN_SPEEDS[current_speed_index]
-            if current_mode != last_op_mode:
+            # A stop always resets, even if a new command re-entered the same mode before this check.
+            mode_entered = current_mode != last_op_mode or op_abort
+            if mode_entered:
+                op_abort = False
                 sub_state = 'DONE'
                 applied_spin_speed = -1
-                for pin in stepper_motor.pins: pin.value(0)
+                stepper_release()
             last_op_mode = current_mode
             old_status = status_message
             
             if current_mode == 'IDLE':
-                status_message = "Ready"
-                for pin in stepper_motor.pins: pin.value(0)
-                await uasyncio.sleep_ms(100)
+                # Only on entry, so messages set by commands while idle stay visible.
+                if mode_entered: status_message = "Ready"
+                await sleep_ms(100)
             elif current_mode == 'SPIN':
                 if applied_spin_speed != desired_spin_speed:
                     applied_spin_speed = desired_spin_speed
-                    stepper_motor.stepms = applied_spin_speed
+                    spin_phase_delay = stepper_phase_delay(applied_spin_speed)
+                    spin_burst_cycles = stepper_burst_cycles(applied_spin_speed)
+                    stepper_release()
                     async with lock:
                         op_params['speed'] = applied_spin_speed
                         status_message = f"Spinning (speed: {applied_spin_speed}ms/step)"
-                stepper_motor.step(1)
-                await uasyncio.sleep_ms(0)
+                while sm_tx_fifo() < 3:
+                    sm_put(spin_burst_cycles - 1)
+                    sm_put(spin_phase_delay)
+                await sleep_ms(50)
             elif current_mode == 'PICTURE':
                 status_message = "Taking picture..."
                 await trigger_camera()
                 async with lock: op_mode, status_message = 'IDLE', "Picture complete. Ready."
             elif current_mode == 'SEQUENCE':
                 if sub_state == 'DONE':
-                    async with lock:
-                        deg = op_params.get('deg', 45)
-                        speed = op_params.get('speed', settings['speeds_ms']['normal'])
-                        delay = op_params.get('delay', settings['photo_delays_ms']['medium'])
-                    stepper_motor.stepms = speed
-                    seq_total_steps = 360 // deg if deg > 0 else 4
-                    seq_steps_per_rotation = int(deg * STEPS_PER_DEGREE)
+                    seq_params = op_params
+                    seq_total_steps, seq_steps_per_rotation = seq_params['_total_steps'], seq_params['_steps_per_rot']
+                    seq_phase_delay, seq_delay = seq_params['_phase_delay'], seq_params['delay']
                     seq_steps_to_rotate_remaining = seq_steps_per_rotation
                     seq_step = 0
                     sub_state = 'TRIGGER'
                 if sub_state == 'TRIGGER':
                     status_message = f"Sequence {seq_step + 1}/{seq_total_steps}: Processing..."
                     await trigger_camera()
-                    async with lock: delay_ms = op_params.get('delay', settings['photo_delays_ms']['medium'])
-                    await uasyncio.sleep_ms(delay_ms)
+                    await sleep_ms(seq_delay)
                     if seq_step >= seq_total_steps - 1:
                         status_message, sub_state = "Sequence complete. Ready.", 'DONE'
                         async with lock: op_mode = 'IDLE'
@@ -357,23 +553,30 @@ async def motor_control_task():
                         sub_state = 'ROTATE'
                 elif sub_state == 'ROTATE':
                     status_message = f"Sequence {seq_step + 1}/{seq_total_steps}: Rotating..."
-                    current_rotation_steps = seq_steps_to_rotate_remaining
-                    for _ in range(current_rotation_steps):
-                        async with lock:
-                            if op_mode != 'SEQUENCE': break
-                        stepper_motor.step(1)
-                        await uasyncio.sleep_ms(0)
-                    if op_mode == 'SEQUENCE':
+                    # The PIO only steps whole 4-phase cycles; carry the remainder into the next rotation.
+                    current_rotation_cycles, seq_steps_to_rotate_remaining = divmod(seq_steps_to_rotate_remaining, 4)
+                    if current_rotation_cycles > 0:
+                        sm_put(current_rotation_cycles - 1)
+                        sm_put(seq_phase_delay)
+                        # The PIO keeps stepping through a collection, so collect while the rotation runs.
+                        gc.collect()
+                        while sm_rx_fifo() == 0:
+                            if op_abort or op_mode != 'SEQUENCE': break
+                            await sleep_ms(50)
+                    if not op_abort and op_mode == 'SEQUENCE':
+                        if sm_rx_fifo(): stepper_sm.get()
                         seq_step += 1
-                        seq_steps_to_rotate_remaining = seq_steps_per_rotation
+                        seq_steps_to_rotate_remaining += seq_steps_per_rotation
                         sub_state = 'TRIGGER'
             
-            if status_message != old_status: await broadcast_status(); last_broadcast_time = utime.ticks_ms()
-            if current_mode == 'IDLE' and utime.ticks_diff(utime.ticks_ms(), last_broadcast_time) > 5000:
-                await broadcast_status(); gc.collect(); last_broadcast_time = utime.ticks_ms()
+            if status_message != old_status: await broadcast_status(); last_broadcast_time = ticks_ms()
+            if current_mode == 'IDLE' and ticks_diff(ticks_ms(), last_broadcast_time) > 5000:
+                await broadcast_status(); last_broadcast_time = ticks_ms()
         except Exception as e:
             print(f"FATAL ERROR in motor task: {e}")
-            async with lock: status_message, op_mode = f"Error: {e}", 'IDLE'
+            # Escaped once here so STATUS_TEMPLATE can embed the message verbatim.
+            async with lock: status_message, op_mode = ujson.dumps(f"Error: {e}")[1:-1], 'IDLE'
+            await sleep_ms(100) # Yield so a repeating error can't starve the web server
 
 # --- Main Asynchronous Execution Function ---
 async def main():
@@ -393,6 +596,10 @@ async def main():
     # --- Give haptic feedback ---
     await pulse_motor(repetitions=2)
     
+    # --- Collect once allocation reaches a quarter of the free heap ---
+    gc.collect()
+    gc.threshold(gc.mem_free() // 4)
+    
     # --- Start background tasks ---
     button.irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=button_handler)
     motor_task = uasyncio.create_task(motor_control_task())